@@ -87,10 +87,14 @@ def plot_multi_analyte_log_with_analysis(
     layers: List[Dict],
     assay_data: pd.DataFrame,
     analytes_with_thresholds: Optional[Dict[str, float]] = None,
-    analysis_methods: Optional[List[str]] = None
+    analysis_methods: Optional[List[str]] = None,
+    precomputed_stats: Optional[Dict[str, Dict[str, float]]] = None
 ) -> plt.Figure: # type: ignore
+    # precomputed_stats: analyte -> row of hole_analyte_stats (mean, std_dev, p25, p75, p90),
+    # used instead of recomputing the thresholds from the values
     analytes_with_thresholds = analytes_with_thresholds or {}
     analysis_methods = analysis_methods or []
+    precomputed_stats = precomputed_stats or {}
 
     if "cutoff" in analysis_methods and not analytes_with_thresholds:
         raise ValueError("Cutoff analysis requires analytes_with_thresholds.")
@@ -134,6 +138,7 @@ def plot_multi_analyte_log_with_analysis(
         to_vals = assay_data["to"]
         midpoints = [(f + t) / 2 for f, t in zip(from_vals, to_vals)]
         values = assay_data[analyte].values
+        stats = precomputed_stats.get(analyte, {})
 
         ax.plot(values, midpoints, color="black", linewidth=1.5)
         ax.set_xlabel(f"{analyte}")
@@ -149,23 +154,23 @@ def plot_multi_analyte_log_with_analysis(
                     ax.fill_betweenx([f, t], 0, v, color="orange", alpha=0.3)
 
         if "zscore" in analysis_methods:
-            mean = np.mean(values) # type: ignore
-            std = np.std(values) # type: ignore
+            mean = stats["mean"] if "mean" in stats else np.mean(values) # type: ignore
+            std = stats["std_dev"] if "std_dev" in stats else np.std(values) # type: ignore
             z_scores = (values - mean) / std
             for f, t, z, v in zip(from_vals, to_vals, z_scores, values):
                 if abs(z) > 2:
                     ax.fill_betweenx([f, t], 0, v, color="purple", alpha=0.2)
 
         if "percentile" in analysis_methods:
-            p90 = np.percentile(values, 90) # type: ignore
+            p90 = stats["p90"] if "p90" in stats else np.percentile(values, 90) # type: ignore
             ax.axvline(x=p90, color="blue", linestyle=":", label="P90")
             for f, t, v in zip(from_vals, to_vals, values):
                 if v > p90:
                     ax.fill_betweenx([f, t], 0, v, color="blue", alpha=0.2)
 
         if "iqr" in analysis_methods:
-            q1 = np.percentile(values, 25) # type: ignore
-            q3 = np.percentile(values, 75) # type: ignore
+            q1 = stats["p25"] if "p25" in stats else np.percentile(values, 25) # type: ignore
+            q3 = stats["p75"] if "p75" in stats else np.percentile(values, 75) # type: ignore
             iqr = q3 - q1
             upper = q3 + 1.5 * iqr
             ax.axvline(x=upper, color="green", linestyle="-.", label="IQR high")
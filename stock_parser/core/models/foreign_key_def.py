@@ -0,0 +1,8 @@
+from dataclasses import dataclass, field
+from typing import List
+
+@dataclass
+class ForeignKeyDef:
+    columns: List[str] = field(default_factory=list[str])
+    ref_table: str = ""
+    ref_columns: List[str] = field(default_factory=list[str])
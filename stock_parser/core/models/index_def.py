@@ -0,0 +1,9 @@
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+@dataclass
+class IndexDef:
+    columns: List[str] = field(default_factory=list[str])
+    name: Optional[str] = None
+    unique: bool = False
+    method: Optional[str] = None
@@ -0,0 +1,13 @@
+from dataclasses import dataclass
+from typing import Optional
+
+@dataclass
+class LedgerEntry:
+    project_id: int
+    target_table: str
+    source_file: str
+    content_hash: Optional[str] = None
+    row_start: Optional[int] = None
+    row_end: Optional[int] = None
+    row_count: Optional[int] = None
+    id: Optional[int] = None
@@ -0,0 +1,17 @@
+from dataclasses import dataclass, field
+from typing import Any, List, Optional
+
+@dataclass
+class PartitionBoundDef:
+    name: str
+    values: Optional[List[Any]] = None
+    range_from: Optional[List[Any]] = None
+    range_to: Optional[List[Any]] = None
+
+@dataclass
+class PartitionDef:
+    strategy: str
+    columns: List[str] = field(default_factory=list[str])
+    modulus: Optional[int] = None
+    partitions: List[PartitionBoundDef] = field(default_factory=list[PartitionBoundDef])
+    default: bool = False
@@ -1,8 +1,18 @@
 from dataclasses import dataclass, field
-from typing import List
+from typing import List, Optional
 from .column_def import ColumnDef
+from .foreign_key_def import ForeignKeyDef
+from .index_def import IndexDef
+from .partition_def import PartitionDef
 
 @dataclass
 class TableDef:
     name: str
     columns: List[ColumnDef] = field(default_factory=list[ColumnDef])
+    foreign_keys: List[ForeignKeyDef] = field(default_factory=list[ForeignKeyDef])
+    indexes: List[IndexDef] = field(default_factory=list[IndexDef])
+    partition: Optional[PartitionDef] = None
+
+    @property
+    def primary_key(self) -> List[str]:
+        return [col.name for col in self.columns if col.primary_key]
@@ -1,4 +1,5 @@
 from abc import ABC, abstractmethod
+from typing import Any, Optional
 
 from stock_parser.core.models.table_def import TableDef
 
@@ -7,6 +8,15 @@ class DatabaseInterface(ABC):
     @abstractmethod
     def execute(self, sql: str) -> None: pass
 
+    @abstractmethod
+    def execute_batch(self, statements: list[tuple[str, list[dict[str, Any]]]]) -> None:
+        """Runs every (sql, params) pair in one transaction; the sql runs once per params item, or once if empty."""
+        pass
+
+    @abstractmethod
+    def fetch_all(self, sql: str, params: Optional[dict[str, Any]] = None) -> list[dict[str, Any]]:
+        pass
+
     @abstractmethod
     def create_table(self, table: TableDef) -> None:
         pass
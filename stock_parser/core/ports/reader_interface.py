@@ -1,5 +1,56 @@
 from abc import ABC, abstractmethod
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Callable, Iterator, Optional
 
 class ReaderInterface(ABC):
     @abstractmethod
     def read(self, path: str) -> list: pass
+
+    def read_many(
+        self,
+        keys: list[str],
+        fetch: Callable[[str], str],
+        max_workers: int = 4,
+        release: Optional[Callable[[str], None]] = None
+    ) -> Iterator[tuple[str, list]]:
+        """
+        Reads many stored files, yielding (key, content) as soon as each one is parsed.
+        fetch resolves a key to a local path (e.g. CachedStorage.acquire) and runs
+        in up to max_workers threads, so downloads overlap the parsing done here.
+        At most 2 * max_workers files are fetched ahead of the parsing; release,
+        when given, is called with each key once its file has been parsed.
+        """
+        pending = iter(keys)
+        in_flight: dict[Future[str], str] = {}
+        executor = ThreadPoolExecutor(max_workers=max_workers)
+
+        def submit_next() -> None:
+            key = next(pending, None)
+            if key is not None:
+                in_flight[executor.submit(fetch, key)] = key
+
+        try:
+            for _ in range(2 * max_workers):
+                submit_next()
+            while in_flight:
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    key = in_flight.pop(future)
+                    submit_next()
+                    # A failed fetch holds nothing, so it is not released
+                    path = future.result()
+                    try:
+                        content = self.read(path)
+                    finally:
+                        if release is not None:
+                            release(key)
+                    yield key, content
+        finally:
+            # Stopped early or failed: release what was fetched but never yielded
+            for future in in_flight:
+                future.cancel()
+            executor.shutdown(wait=True)
+            if release is not None:
+                for future, key in in_flight.items():
+                    if not future.cancelled() and future.exception() is None:
+                        release(key)
@@ -0,0 +1,25 @@
+from abc import ABC, abstractmethod
+from typing import Iterator, Optional
+
+class StorageInterface(ABC):
+
+    @abstractmethod
+    def list_keys(self, prefix: str = "") -> list[str]: pass
+
+    @abstractmethod
+    def size(self, key: str) -> int: pass
+
+    @abstractmethod
+    def version(self, key: str) -> str:
+        """Changes whenever the content of key changes (etag, mtime...)."""
+        pass
+
+    @abstractmethod
+    def read_range(self, key: str, start: int = 0, end: Optional[int] = None) -> bytes:
+        """Reads the bytes [start, end) of key, up to its end when end is None."""
+        pass
+
+    def stream(self, key: str, chunk_size: int = 1 << 20) -> Iterator[bytes]:
+        size = self.size(key)
+        for start in range(0, size, chunk_size):
+            yield self.read_range(key, start, min(start + chunk_size, size))
@@ -0,0 +1,170 @@
+import hashlib
+from dataclasses import dataclass, field
+from typing import Any, Callable, Optional
+from stock_parser.core.models.ledger_entry import LedgerEntry
+from stock_parser.core.models.table_def import TableDef
+from stock_parser.core.ports.database_interface import DatabaseInterface
+from stock_parser.core.services.sql_generator import generate_insert_values_sql, generate_staged_upsert_sql
+
+LEDGER_TABLE = "ingestion_ledger"
+RECOMPUTE_TABLE = "hole_recompute_queue"
+SOURCE_COLUMN = "ingestion_id"
+SCOPE_COLUMN = "project_id"
+HOLE_COLUMN = "borehole_id"
+STAGING_BATCH_SIZE = 1000
+
+@dataclass
+class IngestionPlan:
+    unchanged: list[str] = field(default_factory=list[str])
+    new: list[str] = field(default_factory=list[str])
+    changed: list[str] = field(default_factory=list[str])
+
+    @property
+    def to_load(self) -> list[str]:
+        return self.new + self.changed
+
+def fingerprint_file(path: str, chunk_size: int = 1 << 20) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def plan_ingestion(fingerprints: dict[str, str], ledger: dict[str, LedgerEntry]) -> IngestionPlan:
+    """
+    Splits the source files (path -> content hash) into unchanged, new and changed
+    according to the hashes recorded in the ledger.
+    """
+    plan = IngestionPlan()
+    for path, content_hash in fingerprints.items():
+        entry = ledger.get(path)
+        if entry is None or entry.content_hash is None:
+            plan.new.append(path)
+        elif entry.content_hash == content_hash:
+            plan.unchanged.append(path)
+        else:
+            plan.changed.append(path)
+    return plan
+
+def load_ledger(database: DatabaseInterface, project_id: int, target_table: str) -> dict[str, LedgerEntry]:
+    rows = database.fetch_all(
+        f"SELECT id, project_id, target_table, source_file, content_hash, row_start, row_end, row_count "
+        f"FROM {LEDGER_TABLE} WHERE project_id = :project_id AND target_table = :target_table",
+        {"project_id": project_id, "target_table": target_table}
+    )
+    return {row["source_file"]: LedgerEntry(**row) for row in rows}
+
+def build_recompute_sql(table: TableDef, tables: list[TableDef]) -> Optional[str]:
+    """
+    Builds the statement that queues the holes touched by a merge, reading the
+    rows of the "affected" CTE. Tables without a borehole column are resolved
+    through the first foreign key pointing to a table that has one.
+    """
+    insert = f"INSERT INTO {RECOMPUTE_TABLE} ({SCOPE_COLUMN}, {HOLE_COLUMN})"
+    conflict = f"ON CONFLICT ({SCOPE_COLUMN}, {HOLE_COLUMN}) DO NOTHING;"
+    hole_columns = {SCOPE_COLUMN, HOLE_COLUMN}
+
+    if hole_columns.issubset(col.name for col in table.columns):
+        return (
+            f"{insert}\nSELECT DISTINCT a.{SCOPE_COLUMN}, a.{HOLE_COLUMN} FROM affected a\n"
+            f"WHERE a.{HOLE_COLUMN} IS NOT NULL\n{conflict}"
+        )
+
+    name_to_table = {t.name: t for t in tables}
+    for fk in table.foreign_keys:
+        ref_table = name_to_table.get(fk.ref_table)
+        if ref_table is None or not hole_columns.issubset(col.name for col in ref_table.columns):
+            continue
+        join = " AND ".join(f"r.{ref} = a.{col}" for col, ref in zip(fk.columns, fk.ref_columns))
+        return (
+            f"{insert}\nSELECT DISTINCT r.{SCOPE_COLUMN}, r.{HOLE_COLUMN} FROM affected a\n"
+            f"JOIN {ref_table.name} r ON {join}\n"
+            f"WHERE r.{HOLE_COLUMN} IS NOT NULL\n{conflict}"
+        )
+    return None
+
+def sync_files(
+    database: DatabaseInterface,
+    table: TableDef,
+    tables: list[TableDef],
+    project_id: int,
+    paths: list[str],
+    read_rows: Callable[[str], list[dict[str, Any]]]
+) -> IngestionPlan:
+    """
+    Loads the source files of a project into a table, skipping the files whose
+    content hash matches the ledger. New and changed files are merged one per
+    transaction through a staging table, replacing the rows previously loaded
+    from the same file, and the holes they touch are queued for recompute.
+    """
+    ledger = load_ledger(database, project_id, table.name)
+    fingerprints = {path: fingerprint_file(path) for path in paths}
+    plan = plan_ingestion(fingerprints, ledger)
+    recompute_sql = build_recompute_sql(table, tables)
+    range_columns = [name for name in table.primary_key if name != SCOPE_COLUMN]
+    range_column = range_columns[0] if len(range_columns) == 1 else None
+
+    for path in plan.to_load:
+        rows = [{**row, SCOPE_COLUMN: project_id} for row in read_rows(path)]
+        # An emptied file still goes through the merge so its previous rows get removed
+        columns = list(rows[0].keys()) if rows else table.primary_key
+        source_id = ledger[path].id if path in ledger else register_source(database, project_id, table.name, path)
+        staging_name = f"{table.name}_staging"
+        create_staging, merge = generate_staged_upsert_sql(
+            table, staging_name, columns, SOURCE_COLUMN, SCOPE_COLUMN, recompute_sql
+        )
+        keys = [row[range_column] for row in rows if range_column and row.get(range_column) is not None]
+        statements: list[tuple[str, list[dict[str, Any]]]] = [(create_staging, [])]
+        statements += staging_batches(staging_name, columns, rows)
+        statements += [
+            (merge, [{"scope_id": project_id, "source_id": source_id}]),
+            (
+                f"UPDATE {LEDGER_TABLE} SET content_hash = :content_hash, row_start = :row_start, "
+                f"row_end = :row_end, row_count = :row_count, ingested_at = now() WHERE id = :id",
+                [{
+                    "content_hash": fingerprints[path],
+                    "row_start": min(keys) if keys else None,
+                    "row_end": max(keys) if keys else None,
+                    "row_count": len(rows),
+                    "id": source_id
+                }]
+            ),
+        ]
+        database.execute_batch(statements)
+        print(f'{path}: {len(rows)} rows merged into {table.name}')
+
+    print(f'{len(plan.unchanged)} unchanged files have been skipped')
+    return plan
+
+def staging_batches(
+    staging_name: str,
+    columns: list[str],
+    rows: list[dict[str, Any]],
+    batch_size: int = STAGING_BATCH_SIZE
+) -> list[tuple[str, list[dict[str, Any]]]]:
+    """Splits the rows into multi-row inserts of up to batch_size rows each."""
+    statements: list[tuple[str, list[dict[str, Any]]]] = []
+    for start in range(0, len(rows), batch_size):
+        batch = rows[start:start + batch_size]
+        params = {
+            f"p{row}_{index}": values.get(name)
+            for row, values in enumerate(batch)
+            for index, name in enumerate(columns)
+        }
+        statements.append((generate_insert_values_sql(staging_name, columns, len(batch)), [params]))
+    return statements
+
+def register_source(database: DatabaseInterface, project_id: int, target_table: str, source_file: str) -> int:
+    params = {"project_id": project_id, "target_table": target_table, "source_file": source_file}
+    database.execute_batch([(
+        f"INSERT INTO {LEDGER_TABLE} (project_id, target_table, source_file) "
+        f"VALUES (:project_id, :target_table, :source_file) "
+        f"ON CONFLICT (project_id, target_table, source_file) DO NOTHING",
+        [params]
+    )])
+    rows = database.fetch_all(
+        f"SELECT id FROM {LEDGER_TABLE} WHERE project_id = :project_id "
+        f"AND target_table = :target_table AND source_file = :source_file",
+        params
+    )
+    return rows[0]["id"]
@@ -48,6 +48,14 @@ def sort_tables_by_dependency(
                 else:
                     graph[table.name].add(ref_table)
                     reverse_graph[ref_table].add(table.name)
+        for fk in table.foreign_keys:
+            fk_full = f"{fk.ref_table}.{','.join(fk.ref_columns)}"
+            if fk.ref_table not in existing_tables:
+                if fk_full not in ignore_missing_set:
+                    missing_refs[table.name].add(fk.ref_table)
+            else:
+                graph[table.name].add(fk.ref_table)
+                reverse_graph[fk.ref_table].add(table.name)
 
     if missing_refs:
         msg = "Missing table references detected:\n"
@@ -1,6 +1,10 @@
 import json
+from typing import Any, Optional
 from stock_parser.core.models.table_def import TableDef
 from stock_parser.core.models.column_def import ColumnDef
+from stock_parser.core.models.foreign_key_def import ForeignKeyDef
+from stock_parser.core.models.index_def import IndexDef
+from stock_parser.core.models.partition_def import PartitionBoundDef, PartitionDef
 
 def build_from_json(json_path: str) -> list[TableDef]:
     with open(json_path, "r") as f:
@@ -8,5 +12,19 @@ def build_from_json(json_path: str) -> list[TableDef]:
     tables: list[TableDef] = []
     for table in data:
         columns = [ColumnDef(**col) for col in table["columns"]]
-        tables.append(TableDef(name=table["table_name"], columns=columns))
+        foreign_keys = [ForeignKeyDef(**fk) for fk in table.get("foreign_keys", [])]
+        indexes = [IndexDef(**idx) for idx in table.get("indexes", [])]
+        tables.append(TableDef(
+            name=table["table_name"],
+            columns=columns,
+            foreign_keys=foreign_keys,
+            indexes=indexes,
+            partition=build_partition(table.get("partition"))
+        ))
     return tables
+
+def build_partition(data: Optional[dict[str, Any]]) -> Optional[PartitionDef]:
+    if not data:
+        return None
+    bounds = [PartitionBoundDef(**bound) for bound in data.get("partitions", [])]
+    return PartitionDef(**{**data, "partitions": bounds})
@@ -1,6 +1,13 @@
+import hashlib
+from typing import Any, Optional
+from stock_parser.core.models.index_def import IndexDef
 from stock_parser.core.models.table_def import TableDef
 import re
 
+PARTITION_STRATEGIES = {"list", "hash", "range"}
+INDEX_METHODS = {"btree", "hash", "gist", "gin", "brin", "spgist"}
+MAX_IDENTIFIER_LENGTH = 63
+
 def validate_identifier(identifier: str, kind: str = "identifier") -> None:
     """
     Validates a SQL identifier (table name, column name).
@@ -8,12 +15,29 @@ def validate_identifier(identifier: str, kind: str = "identifier") -> None:
     """
     if not re.match(r'^[a-zA-Z_][a-zA-Z0-9_]*$', identifier):
         raise ValueError(f"Invalid {kind}: '{identifier}'")
+    if len(identifier) > MAX_IDENTIFIER_LENGTH:
+        raise ValueError(
+            f"Invalid {kind}: '{identifier}' is longer than {MAX_IDENTIFIER_LENGTH} characters"
+        )
+
+def fit_identifier(identifier: str) -> str:
+    """
+    Shortens a generated identifier to the Postgres limit, which would otherwise
+    truncate it silently. The hash suffix keeps shortened names distinct.
+    """
+    if len(identifier) <= MAX_IDENTIFIER_LENGTH:
+        return identifier
+    digest = hashlib.sha1(identifier.encode()).hexdigest()[:8]
+    return f"{identifier[:MAX_IDENTIFIER_LENGTH - len(digest) - 1]}_{digest}"
 
 def generate_create_sql(table: TableDef) -> tuple[str, list[str]]:
     validate_identifier(table.name, "table name")
+    validate_table_keys(table)
 
     lines = [f"CREATE TABLE {table.name} ("]
     comments: list[str] = []
+    primary_key = table.primary_key
+    inline_primary_key = len(primary_key) == 1 and table.partition is None
 
     for col in table.columns:
         validate_identifier(col.name, "column name")
@@ -21,9 +45,9 @@ def generate_create_sql(table: TableDef) -> tuple[str, list[str]]:
         col_type = map_type(col.type)
         col_line = f"  {col.name} {col_type}"
 
-        if col.primary_key:
+        if col.primary_key and inline_primary_key:
             col_line += " PRIMARY KEY"
-        if col.required:
+        if col.required or col.primary_key and not inline_primary_key:
             col_line += " NOT NULL"
         if col.unique:
             col_line += " UNIQUE"
@@ -47,11 +71,269 @@ def generate_create_sql(table: TableDef) -> tuple[str, list[str]]:
                 f"COMMENT ON COLUMN {table.name}.{col.name} IS '{sanitized_comment}';"
             )
 
+    if primary_key and not inline_primary_key:
+        lines.append(f"  PRIMARY KEY ({', '.join(primary_key)}),")
+
+    for fk in table.foreign_keys:
+        validate_identifier(fk.ref_table, "foreign key table")
+        for name in fk.columns + fk.ref_columns:
+            validate_identifier(name, "foreign key column")
+        if not fk.columns or len(fk.columns) != len(fk.ref_columns):
+            raise ValueError(
+                f"Foreign key on table '{table.name}' must map the same number of columns: "
+                f"{fk.columns} -> {fk.ref_table}{fk.ref_columns}"
+            )
+        lines.append(
+            f"  FOREIGN KEY ({', '.join(fk.columns)}) "
+            f"REFERENCES {fk.ref_table}({', '.join(fk.ref_columns)}),"
+        )
+
     lines[-1] = lines[-1].rstrip(",")
-    lines.append(");")
+    if table.partition is not None:
+        strategy = table.partition.strategy.upper()
+        lines.append(f") PARTITION BY {strategy} ({', '.join(table.partition.columns)});")
+    else:
+        lines.append(");")
 
     return "\n".join(lines), comments
 
+def validate_table_keys(table: TableDef) -> None:
+    """
+    Validates partitioning, composite keys and index definitions of a table.
+    Postgres requires every unique constraint of a partitioned table to
+    include all of its partition key columns.
+    Raises ValueError if the definition can't be created.
+    """
+    column_names = {col.name for col in table.columns}
+
+    def check_columns(columns: list[str], kind: str) -> None:
+        for name in columns:
+            validate_identifier(name, f"{kind} column")
+            if name not in column_names:
+                raise ValueError(f"Unknown {kind} column '{name}' in table '{table.name}'")
+
+    for fk in table.foreign_keys:
+        check_columns(fk.columns, "foreign key")
+    for index in table.indexes:
+        if not index.columns:
+            raise ValueError(f"Index on table '{table.name}' has no columns")
+        check_columns(index.columns, "index")
+        if index.method is not None and index.method.lower() not in INDEX_METHODS:
+            raise ValueError(f"Unsupported index method: '{index.method}'")
+
+    partition = table.partition
+    if partition is None:
+        return
+    if partition.strategy.lower() not in PARTITION_STRATEGIES:
+        raise ValueError(f"Unsupported partition strategy: '{partition.strategy}'")
+    if not partition.columns:
+        raise ValueError(f"Partition of table '{table.name}' has no key columns")
+    check_columns(partition.columns, "partition")
+
+    partition_columns = set(partition.columns)
+    unique_keys: list[tuple[str, list[str]]] = [("primary key", table.primary_key)]
+    unique_keys += [(f"unique column '{col.name}'", [col.name]) for col in table.columns if col.unique]
+    unique_keys += [
+        (f"unique index on {index.columns}", index.columns) for index in table.indexes if index.unique
+    ]
+    for kind, columns in unique_keys:
+        if columns and not partition_columns.issubset(columns):
+            raise ValueError(
+                f"The {kind} of partitioned table '{table.name}' must include "
+                f"the partition columns {partition.columns}"
+            )
+
+def partition_names(table: TableDef) -> list[str]:
+    partition = table.partition
+    if partition is None:
+        return []
+    if partition.strategy.lower() == "hash":
+        names = [f"{table.name}_p{remainder}" for remainder in range(partition.modulus or 0)]
+    else:
+        names = [f"{table.name}_{bound.name}" for bound in partition.partitions]
+    if partition.default:
+        names.append(f"{table.name}_default")
+    for name in names:
+        validate_identifier(name, "partition name")
+    return names
+
+def generate_partition_sql(table: TableDef) -> list[str]:
+    """
+    Generates the CREATE TABLE ... PARTITION OF statements of a partitioned table.
+    They must run right after the parent table is created and before its indexes.
+    """
+    partition = table.partition
+    if partition is None:
+        return []
+    validate_identifier(table.name, "table name")
+    strategy = partition.strategy.lower()
+    statements: list[str] = []
+
+    if strategy == "hash":
+        if not partition.modulus or partition.modulus < 1:
+            raise ValueError(f"Hash partition of table '{table.name}' requires a positive modulus")
+        if partition.default:
+            raise ValueError(f"Hash partition of table '{table.name}' can't have a default partition")
+        for remainder in range(partition.modulus):
+            validate_identifier(f"{table.name}_p{remainder}", "partition name")
+            statements.append(
+                f"CREATE TABLE {table.name}_p{remainder} PARTITION OF {table.name} "
+                f"FOR VALUES WITH (MODULUS {partition.modulus}, REMAINDER {remainder});"
+            )
+        return statements
+
+    for bound in partition.partitions:
+        name = f"{table.name}_{bound.name}"
+        validate_identifier(name, "partition name")
+        if strategy == "list":
+            if not bound.values:
+                raise ValueError(f"List partition '{name}' requires values")
+            values = ", ".join(render_literal(value) for value in bound.values)
+            spec = f"FOR VALUES IN ({values})"
+        else:
+            if not bound.range_from or not bound.range_to:
+                raise ValueError(f"Range partition '{name}' requires range_from and range_to")
+            range_from = ", ".join(render_literal(value) for value in bound.range_from)
+            range_to = ", ".join(render_literal(value) for value in bound.range_to)
+            spec = f"FOR VALUES FROM ({range_from}) TO ({range_to})"
+        statements.append(f"CREATE TABLE {name} PARTITION OF {table.name} {spec};")
+
+    if partition.default:
+        statements.append(f"CREATE TABLE {table.name}_default PARTITION OF {table.name} DEFAULT;")
+    return statements
+
+def index_name(table: TableDef, index: IndexDef) -> str:
+    name = index.name or fit_identifier(f"{table.name}_{'_'.join(index.columns)}_idx")
+    validate_identifier(name, "index name")
+    return name
+
+def generate_index_sql(table: TableDef) -> list[str]:
+    """
+    Generates the secondary indexes of a table.
+    On partitioned tables the index is created ON ONLY the parent, then on
+    each partition and finally attached, so every partition gets its own
+    named index and no statement has to lock the whole hierarchy.
+    """
+    validate_identifier(table.name, "table name")
+    partitions = partition_names(table)
+    statements: list[str] = []
+    used_names: set[str] = set()
+
+    def claim(name: str) -> None:
+        if name in used_names:
+            raise ValueError(f"Duplicate index name '{name}' on table '{table.name}'")
+        used_names.add(name)
+
+    for index in table.indexes:
+        name = index_name(table, index)
+        claim(name)
+        unique = "UNIQUE " if index.unique else ""
+        method = f" USING {index.method.lower()}" if index.method else ""
+        columns = ", ".join(index.columns)
+        if not partitions:
+            statements.append(f"CREATE {unique}INDEX {name} ON {table.name}{method} ({columns});")
+            continue
+
+        statements.append(f"CREATE {unique}INDEX {name} ON ONLY {table.name}{method} ({columns});")
+        suffix = name[len(table.name) + 1:] if name.startswith(f"{table.name}_") else name
+        for partition in partitions:
+            partition_index = fit_identifier(f"{partition}_{suffix}")
+            validate_identifier(partition_index, "index name")
+            claim(partition_index)
+            statements.append(
+                f"CREATE {unique}INDEX {partition_index} ON {partition}{method} ({columns});"
+            )
+            statements.append(f"ALTER INDEX {name} ATTACH PARTITION {partition_index};")
+    return statements
+
+def generate_staged_upsert_sql(
+    table: TableDef,
+    staging_name: str,
+    columns: list[str],
+    source_column: str,
+    scope_column: str,
+    final_sql: Optional[str] = None
+) -> tuple[str, str]:
+    """
+    Generates the statements that replace the rows of one source file through a
+    temporary staging table: create the staging table and, once it is loaded
+    (see generate_insert_values_sql), merge it into the table.
+    The merge deletes the rows of the source (:scope_id, :source_id) missing from
+    staging and upserts the staging rows on the primary key, skipping rows that
+    didn't change. Deleted rows, written rows and the previous values of updated
+    rows are exposed as the CTE "affected" to final_sql; without it the statement
+    just returns them.
+    """
+    validate_identifier(table.name, "table name")
+    validate_identifier(staging_name, "staging table name")
+    table_columns = {col.name for col in table.columns}
+    for name in columns + [source_column, scope_column]:
+        validate_identifier(name, "column name")
+        if name not in table_columns:
+            raise ValueError(f"Unknown column '{name}' in table '{table.name}'")
+    conflict_columns = table.primary_key
+    if not conflict_columns or not set(conflict_columns).issubset(columns):
+        raise ValueError(f"Staged rows of table '{table.name}' must include its primary key {conflict_columns}")
+    if source_column in columns:
+        raise ValueError(f"Column '{source_column}' is set by the merge and can't be staged")
+
+    create_staging = (
+        f"CREATE TEMP TABLE {staging_name} (LIKE {table.name} INCLUDING DEFAULTS) ON COMMIT DROP;"
+    )
+    key_match = " AND ".join(f"s.{name} = t.{name}" for name in conflict_columns)
+    updated = [name for name in columns if name not in conflict_columns] + [source_column]
+    assignments = ", ".join(f"{name} = EXCLUDED.{name}" for name in updated)
+    current = ", ".join(f"t.{name}" for name in updated)
+    incoming = ", ".join(f"EXCLUDED.{name}" for name in updated)
+    staged = ", ".join(f"s.{name}" for name in updated if name != source_column) + ", :source_id"
+    merge = "\n".join([
+        "WITH previous AS (",
+        f"  SELECT t.* FROM {table.name} t JOIN {staging_name} s ON {key_match}",
+        f"  WHERE t.{scope_column} = :scope_id AND ({current}) IS DISTINCT FROM ({staged})",
+        "), removed AS (",
+        f"  DELETE FROM {table.name} AS t",
+        f"  WHERE t.{scope_column} = :scope_id AND t.{source_column} = :source_id",
+        f"    AND NOT EXISTS (SELECT 1 FROM {staging_name} s WHERE {key_match})",
+        "  RETURNING t.*",
+        "), written AS (",
+        f"  INSERT INTO {table.name} AS t ({', '.join(columns)}, {source_column})",
+        f"  SELECT {', '.join(columns)}, :source_id FROM {staging_name}",
+        f"  ON CONFLICT ({', '.join(conflict_columns)}) DO UPDATE SET {assignments}",
+        f"  WHERE ({current}) IS DISTINCT FROM ({incoming})",
+        "  RETURNING t.*",
+        "), affected AS (",
+        "  SELECT * FROM removed UNION ALL SELECT * FROM written UNION ALL SELECT * FROM previous",
+        ")",
+        final_sql or "SELECT * FROM affected;",
+    ])
+    return create_staging, merge
+
+def generate_insert_values_sql(table_name: str, columns: list[str], row_count: int) -> str:
+    """
+    Generates a multi-row INSERT for row_count rows, bound as :p<row>_<column index>,
+    so a batch of rows costs a single round trip.
+    """
+    validate_identifier(table_name, "table name")
+    for name in columns:
+        validate_identifier(name, "column name")
+    if row_count < 1:
+        raise ValueError("A multi-row insert needs at least one row")
+    values = ", ".join(
+        "(" + ", ".join(f":p{row}_{index}" for index in range(len(columns))) + ")"
+        for row in range(row_count)
+    )
+    return f"INSERT INTO {table_name} ({', '.join(columns)}) VALUES {values};"
+
+def render_literal(value: Any) -> str:
+    if isinstance(value, bool):
+        return "TRUE" if value else "FALSE"
+    if isinstance(value, (int, float)):
+        return str(value)
+    if isinstance(value, str) and value.upper() in ("MINVALUE", "MAXVALUE"):
+        return value.upper()
+    sanitized = str(value).replace("'", "''")
+    return f"'{sanitized}'"
+
 def generate_drop_sql(table: TableDef, if_exists: bool = True, cascade: bool = False) -> str:
     validate_identifier(table.name, "table name")
 
@@ -66,7 +348,9 @@ def map_type(logical_type: str) -> str:
         "integer": "INTEGER",
         "float": "DOUBLE PRECISION",
         "boolean": "BOOLEAN",
-        "date": "DATE"
+        "date": "DATE",
+        "timestamp": "TIMESTAMP",
+        "serial": "SERIAL"
     }
 
     if logical_type in base_types:
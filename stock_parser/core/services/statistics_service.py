@@ -0,0 +1,114 @@
+from typing import Any, Optional
+from stock_parser.core.ports.database_interface import DatabaseInterface
+from stock_parser.core.services.ingestion_service import HOLE_COLUMN, RECOMPUTE_TABLE, SCOPE_COLUMN
+
+STATS_TABLE = "hole_analyte_stats"
+STATS_KEY = [SCOPE_COLUMN, HOLE_COLUMN, "analyte_id", "method_id"]
+STATS_COLUMNS = [
+    "value_count", "value_sum", "value_sum_sq", "value_min", "value_max", "mean", "std_dev",
+    "p25", "p50", "p75", "p90", "iqr_upper", "zscore_outliers", "p90_exceedances", "iqr_outliers"
+]
+
+def generate_stats_refresh_sql() -> str:
+    """
+    Generates the statement that refreshes the analyte statistics of the holes
+    queued for recompute in a project (:project_id) and removes them from the queue.
+    Only the assays of the queued holes are read. Values below 0 (lab sentinels
+    such as -99999) count as 0 and missing values are left out, then population
+    standard deviation and linear interpolated percentiles, per analyte and method.
+    """
+    key = ", ".join(STATS_KEY)
+    outlier_counts = ["zscore_outliers", "p90_exceedances", "iqr_outliers"]
+    aggregated = ", ".join(f"st.{name}" for name in STATS_KEY + STATS_COLUMNS if name not in outlier_counts)
+    assignments = ", ".join(f"{name} = EXCLUDED.{name}" for name in STATS_COLUMNS)
+    key_match = " AND ".join(f"f.{name} = hs.{name}" for name in STATS_KEY)
+    return f"""WITH dirty AS (
+  DELETE FROM {RECOMPUTE_TABLE} WHERE {SCOPE_COLUMN} = :project_id
+  RETURNING {SCOPE_COLUMN}, {HOLE_COLUMN}
+), hole_values AS (
+  SELECT s.project_id, s.borehole_id, a.analyte_id, COALESCE(a.method_id, 0) AS method_id,
+    GREATEST(a.value, 0) AS value
+  FROM dirty d
+  JOIN samples s ON s.project_id = d.{SCOPE_COLUMN} AND s.borehole_id = d.{HOLE_COLUMN}
+  JOIN assays a ON a.project_id = s.project_id AND a.sample_id = s.id
+  WHERE s.project_id = :project_id AND a.project_id = :project_id AND a.value IS NOT NULL
+), st AS (
+  SELECT {key},
+    count(*) AS value_count, sum(value) AS value_sum, sum(value * value) AS value_sum_sq,
+    min(value) AS value_min, max(value) AS value_max,
+    avg(value) AS mean, stddev_pop(value) AS std_dev,
+    percentile_cont(0.25) WITHIN GROUP (ORDER BY value) AS p25,
+    percentile_cont(0.5) WITHIN GROUP (ORDER BY value) AS p50,
+    percentile_cont(0.75) WITHIN GROUP (ORDER BY value) AS p75,
+    percentile_cont(0.9) WITHIN GROUP (ORDER BY value) AS p90,
+    percentile_cont(0.75) WITHIN GROUP (ORDER BY value)
+      + 1.5 * (percentile_cont(0.75) WITHIN GROUP (ORDER BY value)
+      - percentile_cont(0.25) WITHIN GROUP (ORDER BY value)) AS iqr_upper
+  FROM hole_values
+  GROUP BY {key}
+), fresh AS (
+  SELECT {aggregated},
+    count(*) FILTER (WHERE st.std_dev > 0 AND abs(v.value - st.mean) > 2 * st.std_dev) AS zscore_outliers,
+    count(*) FILTER (WHERE v.value > st.p90) AS p90_exceedances,
+    count(*) FILTER (WHERE v.value > st.iqr_upper) AS iqr_outliers
+  FROM st JOIN hole_values v USING ({key})
+  GROUP BY {aggregated}
+), written AS (
+  INSERT INTO {STATS_TABLE} ({key}, {", ".join(STATS_COLUMNS)}, refreshed_at)
+  SELECT {key}, {", ".join(STATS_COLUMNS)}, now() FROM fresh
+  ON CONFLICT ({key}) DO UPDATE SET {assignments}, refreshed_at = EXCLUDED.refreshed_at
+  RETURNING {key}
+)
+DELETE FROM {STATS_TABLE} hs USING dirty d
+WHERE hs.{SCOPE_COLUMN} = d.{SCOPE_COLUMN} AND hs.{HOLE_COLUMN} = d.{HOLE_COLUMN}
+  AND NOT EXISTS (SELECT 1 FROM fresh f WHERE {key_match});"""
+
+def refresh_hole_statistics(database: DatabaseInterface, project_id: int) -> None:
+    database.execute_batch([(generate_stats_refresh_sql(), [{"project_id": project_id}])])
+
+def rebuild_hole_statistics(database: DatabaseInterface, project_id: int) -> None:
+    """
+    Recomputes the statistics of every hole of a project, including data loaded
+    without sync_files. Holes that only have stale statistics are queued too, so
+    their rows get removed.
+    """
+    params = [{"project_id": project_id}]
+    database.execute_batch([
+        (
+            f"INSERT INTO {RECOMPUTE_TABLE} ({SCOPE_COLUMN}, {HOLE_COLUMN}) "
+            f"SELECT {SCOPE_COLUMN}, {HOLE_COLUMN} FROM samples WHERE {SCOPE_COLUMN} = :project_id "
+            f"UNION SELECT {SCOPE_COLUMN}, {HOLE_COLUMN} FROM {STATS_TABLE} WHERE {SCOPE_COLUMN} = :project_id "
+            f"ON CONFLICT ({SCOPE_COLUMN}, {HOLE_COLUMN}) DO NOTHING",
+            params
+        ),
+        (generate_stats_refresh_sql(), params),
+    ])
+
+def fetch_hole_statistics(
+    database: DatabaseInterface,
+    project_id: int,
+    borehole_id: Optional[int] = None,
+    analyte_id: Optional[int] = None
+) -> list[dict[str, Any]]:
+    """
+    Reads the precomputed statistics of a project, optionally narrowed to one hole
+    and/or analyte, instead of aggregating the assays.
+    """
+    sql = f"SELECT {', '.join(STATS_KEY + STATS_COLUMNS)} FROM {STATS_TABLE} WHERE {SCOPE_COLUMN} = :project_id"
+    params: dict[str, Any] = {"project_id": project_id}
+    if borehole_id is not None:
+        sql += f" AND {HOLE_COLUMN} = :borehole_id"
+        params["borehole_id"] = borehole_id
+    if analyte_id is not None:
+        sql += " AND analyte_id = :analyte_id"
+        params["analyte_id"] = analyte_id
+    return database.fetch_all(sql, params)
+
+def fetch_flagged_holes(database: DatabaseInterface, project_id: int) -> list[dict[str, Any]]:
+    """Holes of a project with at least one z-score or IQR outlier, for the sites map."""
+    return database.fetch_all(
+        f"SELECT {HOLE_COLUMN}, sum(zscore_outliers) AS zscore_outliers, sum(iqr_outliers) AS iqr_outliers "
+        f"FROM {STATS_TABLE} WHERE {SCOPE_COLUMN} = :project_id "
+        f"AND (zscore_outliers > 0 OR iqr_outliers > 0) GROUP BY {HOLE_COLUMN}",
+        {"project_id": project_id}
+    )
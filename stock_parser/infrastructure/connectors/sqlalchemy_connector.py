@@ -1,6 +1,12 @@
+from typing import Any, Optional
 from sqlalchemy import create_engine, text
 from stock_parser.core.ports.database_interface import DatabaseInterface
-from stock_parser.core.services.sql_generator import generate_create_sql, generate_drop_sql
+from stock_parser.core.services.sql_generator import (
+    generate_create_sql,
+    generate_drop_sql,
+    generate_index_sql,
+    generate_partition_sql,
+)
 from stock_parser.core.models.table_def import TableDef
 
 class SQLAlchemyConnector(DatabaseInterface):
@@ -11,11 +17,24 @@ class SQLAlchemyConnector(DatabaseInterface):
         with self.engine.begin() as conn:
             conn.execute(text(sql))
 
+    def execute_batch(self, statements: list[tuple[str, list[dict[str, Any]]]]):
+        with self.engine.begin() as conn:
+            for sql, params in statements:
+                if params:
+                    conn.execute(text(sql), params)
+                else:
+                    conn.execute(text(sql))
+
+    def fetch_all(self, sql: str, params: Optional[dict[str, Any]] = None) -> list[dict[str, Any]]:
+        with self.engine.connect() as conn:
+            result = conn.execute(text(sql), params or {})
+            return [dict(row) for row in result.mappings()]
+
     def create_table(self, table: TableDef):
+        # Everything is generated (and validated) first, then created in one transaction
         create_sql, comments = generate_create_sql(table)
-        self.execute(create_sql)
-        for comment_sql in comments:
-            self.execute(comment_sql)
+        statements = [create_sql, *generate_partition_sql(table), *generate_index_sql(table), *comments]
+        self.execute_batch([(sql, []) for sql in statements])
             
     def drop_table(self, table: TableDef):
         drop_sql = generate_drop_sql(table, cascade=True)
@@ -1,5 +1,5 @@
 import json
-from core.ports.reader_interface import ReaderInterface
+from stock_parser.core.ports.reader_interface import ReaderInterface
 
 class JSONReader(ReaderInterface):
     def read(self, path: str):
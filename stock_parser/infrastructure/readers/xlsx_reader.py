@@ -1,11 +1,35 @@
 import pandas as pd
-from core.models.column_def import ColumnDef
-from core.models.table_def import TableDef
+from stock_parser.core.models.column_def import ColumnDef
+from stock_parser.core.models.foreign_key_def import ForeignKeyDef
+from stock_parser.core.models.index_def import IndexDef
+from stock_parser.core.models.partition_def import PartitionBoundDef, PartitionDef
+from stock_parser.core.models.table_def import TableDef
+from stock_parser.core.ports.reader_interface import ReaderInterface
+
+INDEXES_SHEET = "__indexes__"
+FOREIGN_KEYS_SHEET = "__foreign_keys__"
+PARTITIONS_SHEET = "__partitions__"
+
+def split_list(value) -> list: # type: ignore
+    if value is None or pd.isna(value): # type: ignore
+        return []
+    return [item.strip() for item in str(value).split(",") if item.strip()]
+
+def optional_value(value): # type: ignore
+    return None if value is None or pd.isna(value) else value # type: ignore
+
+def find_table(name_to_table: dict[str, TableDef], sheet: str, row) -> TableDef: # type: ignore
+    name = optional_value(row.get("table")) # type: ignore
+    if name not in name_to_table:
+        raise ValueError(f"Sheet '{sheet}' references unknown table '{name}'")
+    return name_to_table[name]
 
 def read_schema_from_xlsx(path: str) -> list[TableDef]:
     workbook = pd.read_excel(path, sheet_name=None) # type: ignore
     tables: list[TableDef] = []
     for sheet_name, df in workbook.items():
+        if sheet_name in (INDEXES_SHEET, FOREIGN_KEYS_SHEET, PARTITIONS_SHEET):
+            continue
         columns: list[ColumnDef] = []
         for _, row in df.iterrows(): # type: ignore
             col = ColumnDef(
@@ -20,4 +44,51 @@ def read_schema_from_xlsx(path: str) -> list[TableDef]:
             )
             columns.append(col)
         tables.append(TableDef(name=sheet_name, columns=columns))
+
+    name_to_table = {table.name: table for table in tables}
+
+    if INDEXES_SHEET in workbook:
+        # One row per index: table, columns ("a, b"), name, unique, method
+        for _, row in workbook[INDEXES_SHEET].iterrows(): # type: ignore
+            find_table(name_to_table, INDEXES_SHEET, row).indexes.append(IndexDef(
+                columns=split_list(row["columns"]),
+                name=optional_value(row.get("name")), # type: ignore
+                unique=bool(optional_value(row.get("unique"))), # type: ignore
+                method=optional_value(row.get("method")) # type: ignore
+            ))
+
+    if FOREIGN_KEYS_SHEET in workbook:
+        # One row per composite key: table, columns, ref_table, ref_columns
+        for _, row in workbook[FOREIGN_KEYS_SHEET].iterrows(): # type: ignore
+            find_table(name_to_table, FOREIGN_KEYS_SHEET, row).foreign_keys.append(ForeignKeyDef(
+                columns=split_list(row["columns"]),
+                ref_table=row["ref_table"], # type: ignore
+                ref_columns=split_list(row["ref_columns"])
+            ))
+
+    if PARTITIONS_SHEET in workbook:
+        # One row per table for hash partitions (modulus) or one row per bound
+        # for list/range partitions (name, values or range_from/range_to)
+        for _, row in workbook[PARTITIONS_SHEET].iterrows(): # type: ignore
+            table = find_table(name_to_table, PARTITIONS_SHEET, row)
+            if table.partition is None:
+                modulus = optional_value(row.get("modulus")) # type: ignore
+                table.partition = PartitionDef(
+                    strategy=row["strategy"], # type: ignore
+                    columns=split_list(row["columns"]),
+                    modulus=int(modulus) if modulus is not None else None, # type: ignore
+                    default=bool(optional_value(row.get("default"))) # type: ignore
+                )
+            bound_name = optional_value(row.get("name")) # type: ignore
+            if bound_name is not None:
+                table.partition.partitions.append(PartitionBoundDef(
+                    name=str(bound_name), # type: ignore
+                    values=split_list(row.get("values")) or None, # type: ignore
+                    range_from=split_list(row.get("range_from")) or None, # type: ignore
+                    range_to=split_list(row.get("range_to")) or None # type: ignore
+                ))
     return tables
+
+class XLSXReader(ReaderInterface):
+    def read(self, path: str) -> list[TableDef]:
+        return read_schema_from_xlsx(path)
@@ -0,0 +1,144 @@
+import hashlib
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Iterator, Optional
+from stock_parser.core.ports.storage_interface import StorageInterface
+
+class CachedStorage(StorageInterface):
+    """
+    Keeps a local on-disk copy of the objects of another storage, evicting the
+    least recently used files once the cache grows over max_bytes.
+    Cached files are named after the key and its version, so a resent object
+    is downloaded again and its old copy ages out of the cache. Files taken with
+    acquire aren't evicted until released.
+    """
+
+    def __init__(self, storage: StorageInterface, cache_dir: str, max_bytes: int = 2 << 30, chunk_size: int = 8 << 20):
+        self.storage = storage
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self.chunk_size = chunk_size
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[str, int] = OrderedDict()
+        self._total_bytes = 0
+        self._pins: dict[str, int] = {}
+        self._acquired: dict[str, list[str]] = {}
+        existing = sorted(
+            (path for path in self.cache_dir.iterdir() if path.is_file() and not path.name.startswith(".")),
+            key=lambda path: path.stat().st_atime
+        )
+        for path in existing:
+            self._entries[path.name] = path.stat().st_size
+            self._total_bytes += self._entries[path.name]
+
+    def list_keys(self, prefix: str = "") -> list[str]:
+        return self.storage.list_keys(prefix)
+
+    def size(self, key: str) -> int:
+        return self.storage.size(key)
+
+    def version(self, key: str) -> str:
+        return self.storage.version(key)
+
+    def read_range(self, key: str, start: int = 0, end: Optional[int] = None) -> bytes:
+        """Served from the cache when key is there, otherwise passed through without caching."""
+        name = self._cache_name(key)
+        with self._lock:
+            cached = name in self._entries
+            if cached:
+                # Pinned so a concurrent eviction can't delete it while it's read
+                self._entries.move_to_end(name)
+                self._pin(key, name)
+        if not cached:
+            return self.storage.read_range(key, start, end)
+        try:
+            with open(self.cache_dir / name, "rb") as f:
+                f.seek(start)
+                return f.read(-1 if end is None else max(end - start, 0))
+        finally:
+            with self._lock:
+                self._unpin(key, name)
+
+    def stream(self, key: str, chunk_size: int = 1 << 20) -> Iterator[bytes]:
+        path = self.acquire(key)
+        try:
+            with open(path, "rb") as f:
+                for chunk in iter(lambda: f.read(chunk_size), b""):
+                    yield chunk
+        finally:
+            self.release(key)
+
+    def acquire(self, key: str) -> str:
+        """Like local_path, but the file is kept in the cache until release(key)."""
+        return self.local_path(key, pin=True)
+
+    def release(self, key: str) -> None:
+        with self._lock:
+            names = self._acquired.get(key)
+            if not names:
+                return
+            self._unpin(key, names[-1])
+
+    def local_path(self, key: str, pin: bool = False) -> str:
+        """Returns the path of the cached copy of key, streaming it from the storage if missing."""
+        name = self._cache_name(key)
+        path = self.cache_dir / name
+        with self._lock:
+            if name in self._entries and path.exists():
+                self._entries.move_to_end(name)
+                if pin:
+                    self._pin(key, name)
+                return os.fspath(path)
+
+        # Download outside the lock so several keys can be fetched at once
+        fd, tmp_name = tempfile.mkstemp(dir=self.cache_dir, prefix=".")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                for chunk in self.storage.stream(key, self.chunk_size):
+                    f.write(chunk)
+            os.replace(tmp_name, path)
+        except BaseException:
+            os.unlink(tmp_name)
+            raise
+
+        with self._lock:
+            self._total_bytes -= self._entries.pop(name, 0)
+            self._entries[name] = path.stat().st_size
+            self._total_bytes += self._entries[name]
+            if pin:
+                self._pin(key, name)
+            self._evict(keep=name)
+        return os.fspath(path)
+
+    def _pin(self, key: str, name: str) -> None:
+        self._pins[name] = self._pins.get(name, 0) + 1
+        self._acquired.setdefault(key, []).append(name)
+
+    def _unpin(self, key: str, name: str) -> None:
+        names = self._acquired[key]
+        names.remove(name)
+        if not names:
+            del self._acquired[key]
+        self._pins[name] -= 1
+        if not self._pins[name]:
+            del self._pins[name]
+        self._evict()
+
+    def _cache_name(self, key: str) -> str:
+        # Keeps the extension, readers like pandas pick the parser from it
+        digest = hashlib.sha256(f"{key}\0{self.storage.version(key)}".encode()).hexdigest()
+        return digest + Path(key).suffix
+
+    def _evict(self, keep: Optional[str] = None) -> None:
+        # Least recently used first, never the file just fetched nor a pinned one
+        for name in list(self._entries):
+            if self._total_bytes <= self.max_bytes:
+                break
+            if name == keep or name in self._pins:
+                continue
+            self._total_bytes -= self._entries.pop(name)
+            (self.cache_dir / name).unlink(missing_ok=True)
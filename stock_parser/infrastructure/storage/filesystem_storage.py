@@ -0,0 +1,38 @@
+import os
+from pathlib import Path
+from typing import Optional
+from stock_parser.core.ports.storage_interface import StorageInterface
+
+class FileSystemStorage(StorageInterface):
+    """Object store stand-in over a local directory: keys are paths relative to root."""
+
+    def __init__(self, root: str):
+        self.root = Path(root).resolve()
+
+    def _path(self, key: str) -> Path:
+        path = (self.root / key).resolve()
+        if not path.is_relative_to(self.root):
+            raise ValueError(f"Invalid storage key: '{key}'")
+        return path
+
+    def list_keys(self, prefix: str = "") -> list[str]:
+        keys = [
+            path.relative_to(self.root).as_posix()
+            for path in self.root.rglob("*") if path.is_file()
+        ]
+        return sorted(key for key in keys if key.startswith(prefix))
+
+    def size(self, key: str) -> int:
+        return self._path(key).stat().st_size
+
+    def version(self, key: str) -> str:
+        stat = self._path(key).stat()
+        return f"{stat.st_mtime_ns}-{stat.st_size}"
+
+    def read_range(self, key: str, start: int = 0, end: Optional[int] = None) -> bytes:
+        with open(self._path(key), "rb") as f:
+            f.seek(start)
+            return f.read(-1 if end is None else max(end - start, 0))
+
+    def local_path(self, key: str) -> str:
+        return os.fspath(self._path(key))
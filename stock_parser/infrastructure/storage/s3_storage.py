@@ -0,0 +1,32 @@
+from typing import Iterator, Optional
+import boto3
+from stock_parser.core.ports.storage_interface import StorageInterface
+
+class S3Storage(StorageInterface):
+    def __init__(self, bucket: str, endpoint_url: Optional[str] = None, **client_kwargs):
+        self.bucket = bucket
+        self.client = boto3.client("s3", endpoint_url=endpoint_url, **client_kwargs)
+
+    def list_keys(self, prefix: str = "") -> list[str]:
+        paginator = self.client.get_paginator("list_objects_v2")
+        keys: list[str] = []
+        for page in paginator.paginate(Bucket=self.bucket, Prefix=prefix):
+            keys.extend(obj["Key"] for obj in page.get("Contents", []))
+        return keys
+
+    def size(self, key: str) -> int:
+        return self.client.head_object(Bucket=self.bucket, Key=key)["ContentLength"]
+
+    def version(self, key: str) -> str:
+        return self.client.head_object(Bucket=self.bucket, Key=key)["ETag"].strip('"')
+
+    def read_range(self, key: str, start: int = 0, end: Optional[int] = None) -> bytes:
+        if end is not None and end <= start:
+            return b""
+        byte_range = f"bytes={start}-{'' if end is None else end - 1}"
+        response = self.client.get_object(Bucket=self.bucket, Key=key, Range=byte_range)
+        return response["Body"].read()
+
+    def stream(self, key: str, chunk_size: int = 1 << 20) -> Iterator[bytes]:
+        response = self.client.get_object(Bucket=self.bucket, Key=key)
+        yield from response["Body"].iter_chunks(chunk_size)
@@ -0,0 +1,28 @@
+from typing import Any, Optional
+
+from stock_parser.core.models.table_def import TableDef
+from stock_parser.core.ports.database_interface import DatabaseInterface
+
+
+class RecordingDatabase(DatabaseInterface):
+    """Records the statements it gets; fetch_all answers from queued results by SQL prefix."""
+
+    def __init__(self, results: Optional[dict[str, list[dict[str, Any]]]] = None):
+        self.batches: list[list[tuple[str, list[dict[str, Any]]]]] = []
+        self.results = results or {}
+
+    def execute(self, sql: str) -> None:
+        self.batches.append([(sql, [])])
+
+    def execute_batch(self, statements: list[tuple[str, list[dict[str, Any]]]]) -> None:
+        self.batches.append(statements)
+
+    def fetch_all(self, sql: str, params: Optional[dict[str, Any]] = None) -> list[dict[str, Any]]:
+        for prefix, rows in self.results.items():
+            if sql.startswith(prefix):
+                return rows
+        return []
+
+    def create_table(self, table: TableDef) -> None: pass
+
+    def drop_table(self, table: TableDef) -> None: pass
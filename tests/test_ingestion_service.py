@@ -0,0 +1,138 @@
+from pathlib import Path
+from typing import Any
+
+from stock_parser.core.models.column_def import ColumnDef
+from stock_parser.core.models.foreign_key_def import ForeignKeyDef
+from stock_parser.core.models.ledger_entry import LedgerEntry
+from stock_parser.core.models.table_def import TableDef
+from stock_parser.core.services.ingestion_service import (
+    build_recompute_sql,
+    fingerprint_file,
+    plan_ingestion,
+    sync_files,
+)
+from tests.fakes import RecordingDatabase
+
+
+def make_samples() -> TableDef:
+    return TableDef(name="samples", columns=[
+        ColumnDef(name="project_id", type="integer", primary_key=True, required=True),
+        ColumnDef(name="id", type="integer", primary_key=True, required=True),
+        ColumnDef(name="borehole_id", type="integer"),
+        ColumnDef(name="ingestion_id", type="integer"),
+    ])
+
+
+def make_assays() -> TableDef:
+    return TableDef(
+        name="assays",
+        columns=[
+            ColumnDef(name="project_id", type="integer", primary_key=True, required=True),
+            ColumnDef(name="id", type="integer", primary_key=True, required=True),
+            ColumnDef(name="sample_id", type="integer"),
+            ColumnDef(name="ingestion_id", type="integer"),
+        ],
+        foreign_keys=[ForeignKeyDef(columns=["project_id", "sample_id"], ref_table="samples", ref_columns=["project_id", "id"])],
+    )
+
+
+def ledger_row(path: str, content_hash: Any, id: int) -> dict[str, Any]:
+    return {
+        "id": id, "project_id": 1, "target_table": "samples", "source_file": path,
+        "content_hash": content_hash, "row_start": None, "row_end": None, "row_count": None,
+    }
+
+
+def test_plan_ingestion_splits_files():
+    ledger = {
+        "same.csv": LedgerEntry(1, "samples", "same.csv", content_hash="a"),
+        "edited.csv": LedgerEntry(1, "samples", "edited.csv", content_hash="b"),
+        "registered.csv": LedgerEntry(1, "samples", "registered.csv", content_hash=None),
+    }
+    plan = plan_ingestion(
+        {"same.csv": "a", "edited.csv": "c", "registered.csv": "d", "fresh.csv": "e"}, ledger
+    )
+    assert plan.unchanged == ["same.csv"]
+    assert plan.changed == ["edited.csv"]
+    assert plan.new == ["registered.csv", "fresh.csv"]
+    assert plan.to_load == ["registered.csv", "fresh.csv", "edited.csv"]
+
+
+def test_build_recompute_sql_uses_direct_columns():
+    sql = build_recompute_sql(make_samples(), [make_samples()])
+    assert sql is not None
+    assert "SELECT DISTINCT a.project_id, a.borehole_id FROM affected a" in sql
+    assert "JOIN" not in sql
+
+
+def test_build_recompute_sql_follows_foreign_key():
+    tables = [make_samples(), make_assays()]
+    sql = build_recompute_sql(make_assays(), tables)
+    assert sql is not None
+    assert "SELECT DISTINCT r.project_id, r.borehole_id FROM affected a" in sql
+    assert "JOIN samples r ON r.project_id = a.project_id AND r.id = a.sample_id" in sql
+
+
+def test_build_recompute_sql_without_hole():
+    assert build_recompute_sql(make_assays(), [make_assays()]) is None
+
+
+def test_sync_files_skips_unchanged_and_merges_the_rest(tmp_path: Path):
+    unchanged, changed, emptied = (tmp_path / name for name in ("same.csv", "edited.csv", "empty.csv"))
+    unchanged.write_text("same")
+    changed.write_text("edited")
+    emptied.write_text("")
+    database = RecordingDatabase({
+        "SELECT id, project_id": [
+            ledger_row(str(unchanged), fingerprint_file(str(unchanged)), 10),
+            ledger_row(str(changed), "old hash", 11),
+            ledger_row(str(emptied), "old hash", 12),
+        ],
+    })
+    rows = {
+        str(changed): [{"id": 7, "borehole_id": 1}, {"id": 3, "borehole_id": 2}],
+        str(emptied): [],
+    }
+    read: list[str] = []
+
+    def read_rows(path: str) -> list[dict[str, Any]]:
+        read.append(path)
+        return rows[path]
+
+    plan = sync_files(database, make_samples(), [make_samples()], 1, [str(unchanged), str(changed), str(emptied)], read_rows)
+
+    assert plan.unchanged == [str(unchanged)]
+    assert read == [str(changed), str(emptied)]
+    changed_batch, emptied_batch = database.batches
+
+    sqls = [sql for sql, _ in changed_batch]
+    assert sqls[0].startswith("CREATE TEMP TABLE samples_staging")
+    assert sqls[1].startswith("INSERT INTO samples_staging (id, borehole_id, project_id) VALUES")
+    assert sqls[2].startswith("WITH previous AS (")
+    assert changed_batch[2][1] == [{"scope_id": 1, "source_id": 11}]
+    assert sqls[3].startswith("UPDATE ingestion_ledger SET content_hash")
+    assert changed_batch[3][1] == [{
+        "content_hash": fingerprint_file(str(changed)),
+        "row_start": 3,
+        "row_end": 7,
+        "row_count": 2,
+        "id": 11,
+    }]
+
+    # An emptied file still merges, so its previous rows get deleted
+    assert [sql.split(" ")[0] for sql, _ in emptied_batch] == ["CREATE", "WITH", "UPDATE"]
+    assert emptied_batch[1][1] == [{"scope_id": 1, "source_id": 12}]
+    assert emptied_batch[2][1][0]["row_count"] == 0
+    assert emptied_batch[2][1][0]["row_start"] is None
+
+
+def test_sync_files_registers_new_files(tmp_path: Path):
+    path = tmp_path / "fresh.csv"
+    path.write_text("fresh")
+    database = RecordingDatabase({"SELECT id FROM ingestion_ledger": [{"id": 42}]})
+    plan = sync_files(database, make_samples(), [make_samples()], 1, [str(path)], lambda _: [{"id": 1, "borehole_id": 5}])
+    assert plan.new == [str(path)]
+    register, merge = database.batches
+    assert register[0][0].startswith("INSERT INTO ingestion_ledger (project_id, target_table, source_file)")
+    assert merge[2][1] == [{"scope_id": 1, "source_id": 42}]
+    assert merge[3][1][0]["id"] == 42
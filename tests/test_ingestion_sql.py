@@ -0,0 +1,67 @@
+import pytest
+
+from stock_parser.core.models.column_def import ColumnDef
+from stock_parser.core.models.table_def import TableDef
+from stock_parser.core.services.ingestion_service import staging_batches
+from stock_parser.core.services.sql_generator import generate_insert_values_sql, generate_staged_upsert_sql
+
+
+def make_table() -> TableDef:
+    return TableDef(name="samples", columns=[
+        ColumnDef(name="project_id", type="integer", primary_key=True, required=True),
+        ColumnDef(name="id", type="integer", primary_key=True, required=True),
+        ColumnDef(name="borehole_id", type="integer"),
+        ColumnDef(name="ingestion_id", type="integer"),
+    ])
+
+
+def test_merge_exposes_previous_values_of_updated_rows():
+    create_staging, merge = generate_staged_upsert_sql(
+        make_table(), "samples_staging", ["project_id", "id", "borehole_id"], "ingestion_id", "project_id"
+    )
+    assert create_staging == (
+        "CREATE TEMP TABLE samples_staging (LIKE samples INCLUDING DEFAULTS) ON COMMIT DROP;"
+    )
+    assert merge.startswith("WITH previous AS (")
+    assert "JOIN samples_staging s ON s.project_id = t.project_id AND s.id = t.id" in merge
+    assert (
+        "WHERE t.project_id = :scope_id AND (t.borehole_id, t.ingestion_id) IS DISTINCT FROM (s.borehole_id, :source_id)"
+    ) in merge
+    assert "\n), removed AS (\n  DELETE FROM samples AS t\n" in merge
+    assert "ON CONFLICT (project_id, id) DO UPDATE SET borehole_id = EXCLUDED.borehole_id" in merge
+    assert "SELECT * FROM removed UNION ALL SELECT * FROM written UNION ALL SELECT * FROM previous" in merge
+    assert merge.endswith("SELECT * FROM affected;")
+
+
+@pytest.mark.parametrize("columns, message", [
+    (["project_id", "id", "missing"], "Unknown column 'missing'"),
+    (["project_id", "borehole_id"], "must include its primary key"),
+    (["project_id", "id", "ingestion_id"], "set by the merge"),
+    (["project_id", "id", "bad name"], "Invalid column name"),
+])
+def test_staged_upsert_validation(columns, message):
+    with pytest.raises(ValueError, match=message):
+        generate_staged_upsert_sql(make_table(), "samples_staging", columns, "ingestion_id", "project_id")
+
+
+def test_staged_upsert_rejects_invalid_staging_name():
+    with pytest.raises(ValueError, match="Invalid staging table name"):
+        generate_staged_upsert_sql(make_table(), "samples-staging", ["project_id", "id"], "ingestion_id", "project_id")
+
+
+def test_insert_values_binds_every_row():
+    assert generate_insert_values_sql("samples_staging", ["id", "borehole_id"], 2) == (
+        "INSERT INTO samples_staging (id, borehole_id) VALUES (:p0_0, :p0_1), (:p1_0, :p1_1);"
+    )
+    with pytest.raises(ValueError):
+        generate_insert_values_sql("samples_staging", ["id"], 0)
+
+
+def test_staging_batches_split_rows():
+    rows = [{"id": i, "borehole_id": i * 10} for i in range(5)]
+    statements = staging_batches("samples_staging", ["id", "borehole_id"], rows, batch_size=2)
+    assert len(statements) == 3
+    sql, params = statements[2]
+    assert sql == "INSERT INTO samples_staging (id, borehole_id) VALUES (:p0_0, :p0_1);"
+    assert params == [{"p0_0": 4, "p0_1": 40}]
+    assert staging_batches("samples_staging", ["id"], []) == []
@@ -0,0 +1,117 @@
+import json
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from stock_parser.core.models.partition_def import PartitionBoundDef, PartitionDef
+from stock_parser.core.services.schema_builder import build_from_json
+from stock_parser.core.services.sql_generator import generate_partition_sql
+from stock_parser.infrastructure.readers import xlsx_reader
+from stock_parser.infrastructure.readers.xlsx_reader import read_schema_from_xlsx
+
+NAN = float("nan")
+
+COLUMNS = pd.DataFrame([
+    {"name": "project_id", "type": "integer", "primary_key": True, "required": True},
+    {"name": "id", "type": "integer", "primary_key": True, "required": True},
+    {"name": "sample_id", "type": "integer", "primary_key": False, "required": False},
+])
+
+
+def fake_workbook(monkeypatch: pytest.MonkeyPatch, sheets: dict[str, pd.DataFrame]) -> None:
+    monkeypatch.setattr(xlsx_reader.pd, "read_excel", lambda path, sheet_name=None: sheets)
+
+
+def test_json_model_options(tmp_path: Path):
+    model = [
+        {"table_name": "samples", "columns": [{"name": "project_id", "type": "integer"}, {"name": "id", "type": "integer"}]},
+        {
+            "table_name": "assays",
+            "columns": [{"name": "project_id", "type": "integer"}, {"name": "sample_id", "type": "integer"}],
+            "foreign_keys": [{"columns": ["project_id", "sample_id"], "ref_table": "samples", "ref_columns": ["project_id", "id"]}],
+            "indexes": [{"columns": ["project_id", "sample_id"], "unique": True}],
+            "partition": {
+                "strategy": "list",
+                "columns": ["project_id"],
+                "partitions": [{"name": "p1", "values": [1]}],
+                "default": True,
+            },
+        },
+    ]
+    path = tmp_path / "model.json"
+    path.write_text(json.dumps(model))
+    samples, assays = build_from_json(str(path))
+    assert samples.partition is None and samples.indexes == [] and samples.foreign_keys == []
+    assert assays.foreign_keys[0].ref_columns == ["project_id", "id"]
+    assert assays.indexes[0].unique is True
+    assert assays.partition == PartitionDef(
+        strategy="list",
+        columns=["project_id"],
+        partitions=[PartitionBoundDef(name="p1", values=[1])],
+        default=True,
+    )
+
+
+def test_xlsx_indexes_and_foreign_keys(monkeypatch: pytest.MonkeyPatch):
+    fake_workbook(monkeypatch, {
+        "assays": COLUMNS,
+        "__indexes__": pd.DataFrame([
+            {"table": "assays", "columns": "project_id, sample_id", "name": NAN, "unique": NAN, "method": NAN},
+            {"table": "assays", "columns": "sample_id", "name": "assays_sample_idx", "unique": True, "method": "hash"},
+        ]),
+        "__foreign_keys__": pd.DataFrame([
+            {"table": "assays", "columns": "project_id,sample_id", "ref_table": "samples", "ref_columns": " project_id , id "},
+        ]),
+    })
+    (assays,) = read_schema_from_xlsx("model.xlsx")
+    first, second = assays.indexes
+    assert first.columns == ["project_id", "sample_id"]
+    assert (first.name, first.unique, first.method) == (None, False, None)
+    assert (second.name, second.unique, second.method) == ("assays_sample_idx", True, "hash")
+    assert assays.foreign_keys[0].columns == ["project_id", "sample_id"]
+    assert assays.foreign_keys[0].ref_columns == ["project_id", "id"]
+
+
+def test_xlsx_hash_partition_modulus_is_int(monkeypatch: pytest.MonkeyPatch):
+    # Numeric cells of a column with blanks come back as floats
+    fake_workbook(monkeypatch, {
+        "assays": COLUMNS,
+        "__partitions__": pd.DataFrame([
+            {"table": "assays", "strategy": "hash", "columns": "project_id", "modulus": 4.0, "default": NAN, "name": NAN},
+        ]),
+    })
+    (assays,) = read_schema_from_xlsx("model.xlsx")
+    assert assays.partition == PartitionDef(strategy="hash", columns=["project_id"], modulus=4)
+    assert isinstance(assays.partition.modulus, int)
+    assert len(generate_partition_sql(assays)) == 4
+
+
+def test_xlsx_list_partition_over_several_rows(monkeypatch: pytest.MonkeyPatch):
+    fake_workbook(monkeypatch, {
+        "assays": COLUMNS,
+        "__partitions__": pd.DataFrame([
+            {"table": "assays", "strategy": "list", "columns": "project_id", "modulus": NAN, "default": True, "name": "p1", "values": "1, 2"},
+            {"table": "assays", "strategy": "list", "columns": "project_id", "modulus": NAN, "default": True, "name": "p3", "values": "3"},
+        ]),
+    })
+    (assays,) = read_schema_from_xlsx("model.xlsx")
+    assert assays.partition.modulus is None
+    assert assays.partition.default is True
+    assert assays.partition.partitions == [
+        PartitionBoundDef(name="p1", values=["1", "2"]),
+        PartitionBoundDef(name="p3", values=["3"]),
+    ]
+    assert generate_partition_sql(assays) == [
+        "CREATE TABLE assays_p1 PARTITION OF assays FOR VALUES IN ('1', '2');",
+        "CREATE TABLE assays_p3 PARTITION OF assays FOR VALUES IN ('3');",
+        "CREATE TABLE assays_default PARTITION OF assays DEFAULT;",
+    ]
+
+
+@pytest.mark.parametrize("sheet", ["__indexes__", "__foreign_keys__", "__partitions__"])
+def test_xlsx_unknown_table_names_sheet_and_table(monkeypatch: pytest.MonkeyPatch, sheet: str):
+    row = {"table": "missing", "columns": "id", "ref_table": "assays", "ref_columns": "id", "strategy": "hash", "modulus": 2}
+    fake_workbook(monkeypatch, {"assays": COLUMNS, sheet: pd.DataFrame([row])})
+    with pytest.raises(ValueError, match=f"Sheet '{sheet}' references unknown table 'missing'"):
+        read_schema_from_xlsx("model.xlsx")
@@ -0,0 +1,125 @@
+import pytest
+
+from stock_parser.core.models.column_def import ColumnDef
+from stock_parser.core.models.index_def import IndexDef
+from stock_parser.core.models.partition_def import PartitionBoundDef, PartitionDef
+from stock_parser.core.models.table_def import TableDef
+from stock_parser.core.services.sql_generator import (
+    MAX_IDENTIFIER_LENGTH,
+    generate_create_sql,
+    generate_index_sql,
+    generate_partition_sql,
+    validate_table_keys,
+)
+
+
+def make_table(name: str = "assays", **kwargs) -> TableDef:
+    columns = [
+        ColumnDef(name="project_id", type="integer", primary_key=True, required=True),
+        ColumnDef(name="id", type="integer", primary_key=True, required=True),
+        ColumnDef(name="sample_id", type="integer"),
+        ColumnDef(name="value", type="float"),
+    ]
+    return TableDef(name=name, columns=columns, **kwargs)
+
+
+def test_create_sql_emits_composite_key_and_partition_clause():
+    table = make_table(partition=PartitionDef(strategy="hash", columns=["project_id"], modulus=2))
+    create_sql, _ = generate_create_sql(table)
+    assert "  PRIMARY KEY (project_id, id)" in create_sql
+    assert " PRIMARY KEY," not in create_sql
+    assert create_sql.endswith(") PARTITION BY HASH (project_id);")
+
+
+def test_hash_partitions():
+    table = make_table(partition=PartitionDef(strategy="hash", columns=["project_id"], modulus=2))
+    assert generate_partition_sql(table) == [
+        "CREATE TABLE assays_p0 PARTITION OF assays FOR VALUES WITH (MODULUS 2, REMAINDER 0);",
+        "CREATE TABLE assays_p1 PARTITION OF assays FOR VALUES WITH (MODULUS 2, REMAINDER 1);",
+    ]
+
+
+def test_list_partitions_with_default():
+    table = make_table(partition=PartitionDef(
+        strategy="list",
+        columns=["project_id"],
+        partitions=[PartitionBoundDef(name="p1", values=[1, "o'k"])],
+        default=True,
+    ))
+    assert generate_partition_sql(table) == [
+        "CREATE TABLE assays_p1 PARTITION OF assays FOR VALUES IN (1, 'o''k');",
+        "CREATE TABLE assays_default PARTITION OF assays DEFAULT;",
+    ]
+
+
+def test_index_on_partitioned_table_is_built_per_partition_then_attached():
+    table = make_table(
+        partition=PartitionDef(strategy="hash", columns=["project_id"], modulus=2),
+        indexes=[IndexDef(columns=["project_id", "sample_id"])],
+    )
+    assert generate_index_sql(table) == [
+        "CREATE INDEX assays_project_id_sample_id_idx ON ONLY assays (project_id, sample_id);",
+        "CREATE INDEX assays_p0_project_id_sample_id_idx ON assays_p0 (project_id, sample_id);",
+        "ALTER INDEX assays_project_id_sample_id_idx ATTACH PARTITION assays_p0_project_id_sample_id_idx;",
+        "CREATE INDEX assays_p1_project_id_sample_id_idx ON assays_p1 (project_id, sample_id);",
+        "ALTER INDEX assays_project_id_sample_id_idx ATTACH PARTITION assays_p1_project_id_sample_id_idx;",
+    ]
+
+
+def test_index_on_plain_table():
+    table = make_table(indexes=[IndexDef(columns=["sample_id"], unique=True, method="BTREE")])
+    assert generate_index_sql(table) == [
+        "CREATE UNIQUE INDEX assays_sample_id_idx ON assays USING btree (sample_id);"
+    ]
+
+
+def test_long_generated_index_names_are_shortened_and_distinct():
+    name = "a" * 50
+    table = make_table(
+        name=name,
+        partition=PartitionDef(strategy="hash", columns=["project_id"], modulus=12),
+        indexes=[IndexDef(columns=["project_id", "sample_id"]), IndexDef(columns=["project_id", "value"])],
+    )
+    statements = generate_index_sql(table)
+    names = [sql.split(" ")[2] for sql in statements if sql.startswith("CREATE")]
+    assert all(len(index) <= MAX_IDENTIFIER_LENGTH for index in names)
+    assert len(names) == len(set(names)) == 26
+
+
+def test_explicit_index_name_over_limit_is_rejected():
+    table = make_table(indexes=[IndexDef(columns=["sample_id"], name="i" * 64)])
+    with pytest.raises(ValueError, match="longer than 63"):
+        generate_index_sql(table)
+
+
+def test_duplicate_index_names_are_rejected():
+    table = make_table(indexes=[IndexDef(columns=["sample_id"]), IndexDef(columns=["sample_id"], method="hash")])
+    with pytest.raises(ValueError, match="Duplicate index name"):
+        generate_index_sql(table)
+
+
+@pytest.mark.parametrize("kwargs, message", [
+    ({"partition": PartitionDef(strategy="interval", columns=["project_id"])}, "Unsupported partition strategy"),
+    ({"partition": PartitionDef(strategy="hash", columns=[], modulus=2)}, "has no key columns"),
+    ({"partition": PartitionDef(strategy="hash", columns=["missing"], modulus=2)}, "Unknown partition column"),
+    ({"partition": PartitionDef(strategy="hash", columns=["sample_id"], modulus=2)}, "primary key"),
+    (
+        {
+            "partition": PartitionDef(strategy="hash", columns=["project_id"], modulus=2),
+            "indexes": [IndexDef(columns=["sample_id"], unique=True)],
+        },
+        "unique index",
+    ),
+    ({"indexes": [IndexDef(columns=[])]}, "has no columns"),
+    ({"indexes": [IndexDef(columns=["missing"])]}, "Unknown index column"),
+    ({"indexes": [IndexDef(columns=["value"], method="bitmap")]}, "Unsupported index method"),
+])
+def test_validate_table_keys_errors(kwargs, message):
+    with pytest.raises(ValueError, match=message):
+        validate_table_keys(make_table(**kwargs))
+
+
+def test_hash_partition_names_over_limit_are_rejected():
+    table = make_table(name="a" * 62, partition=PartitionDef(strategy="hash", columns=["project_id"], modulus=2))
+    with pytest.raises(ValueError, match="partition name"):
+        generate_partition_sql(table)
@@ -0,0 +1,26 @@
+from stock_parser.core.services.statistics_service import generate_stats_refresh_sql, rebuild_hole_statistics
+from tests.fakes import RecordingDatabase
+
+
+def test_refresh_clamps_negative_values_and_skips_missing_ones():
+    sql = generate_stats_refresh_sql()
+    assert "GREATEST(a.value, 0) AS value" in sql
+    assert "a.value IS NOT NULL" in sql
+    assert sql.startswith("WITH dirty AS (\n  DELETE FROM hole_recompute_queue WHERE project_id = :project_id")
+
+
+def test_refresh_filters_samples_and_assays_by_project():
+    sql = generate_stats_refresh_sql()
+    assert "WHERE s.project_id = :project_id AND a.project_id = :project_id AND a.value IS NOT NULL" in sql
+
+
+def test_rebuild_queues_every_hole_then_refreshes_in_one_transaction():
+    database = RecordingDatabase()
+    rebuild_hole_statistics(database, 7)
+    assert len(database.batches) == 1
+    (queue_sql, queue_params), (refresh_sql, refresh_params) = database.batches[0]
+    assert queue_sql.startswith("INSERT INTO hole_recompute_queue (project_id, borehole_id) SELECT")
+    assert "FROM samples WHERE project_id = :project_id" in queue_sql
+    assert "FROM hole_analyte_stats WHERE project_id = :project_id" in queue_sql
+    assert refresh_sql == generate_stats_refresh_sql()
+    assert queue_params == refresh_params == [{"project_id": 7}]
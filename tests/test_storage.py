@@ -0,0 +1,158 @@
+import json
+import os
+import threading
+from pathlib import Path
+
+import pytest
+
+from stock_parser.core.ports.reader_interface import ReaderInterface
+from stock_parser.infrastructure.storage.cached_storage import CachedStorage
+from stock_parser.infrastructure.storage.filesystem_storage import FileSystemStorage
+
+
+class JSONFileReader(ReaderInterface):
+    def read(self, path: str) -> list:
+        with open(path) as f:
+            return json.load(f)
+
+
+class FailingReader(ReaderInterface):
+    def read(self, path: str) -> list:
+        raise ValueError("broken sheet")
+
+
+def write_sheets(root: Path, count: int, size: int = 100) -> list[str]:
+    (root / "sheets").mkdir(parents=True)
+    for i in range(count):
+        content = json.dumps([i])
+        (root / "sheets" / f"s{i}.json").write_text(content.ljust(size))
+    return [f"sheets/s{i}.json" for i in range(count)]
+
+
+@pytest.fixture
+def storage(tmp_path: Path) -> FileSystemStorage:
+    return FileSystemStorage(str(tmp_path / "store"))
+
+
+def test_filesystem_storage_reads(tmp_path: Path, storage: FileSystemStorage):
+    keys = write_sheets(tmp_path / "store", 3, size=10)
+    assert storage.list_keys("sheets/") == keys
+    assert storage.read_range(keys[0], 1, 4) == b"0] "
+    assert b"".join(storage.stream(keys[0], chunk_size=3)) == b"[0]".ljust(10)
+    with pytest.raises(ValueError, match="Invalid storage key"):
+        storage.read_range("../outside")
+
+
+def test_read_many_prefetch_is_bounded(tmp_path: Path, storage: FileSystemStorage):
+    keys = write_sheets(tmp_path / "store", 10)
+    started: list[str] = []
+    lock = threading.Lock()
+
+    def fetch(key: str) -> str:
+        with lock:
+            started.append(key)
+        return storage.local_path(key)
+
+    reader = iter(JSONFileReader().read_many(keys, fetch, max_workers=2))
+    next(reader)
+    assert len(started) <= 2 * 2 + 1
+    assert len(list(reader)) == 9
+    assert len(started) == 10
+
+
+def test_read_many_yields_every_key(tmp_path: Path, storage: FileSystemStorage):
+    keys = write_sheets(tmp_path / "store", 10)
+    cache = CachedStorage(storage, str(tmp_path / "cache"), max_bytes=250)
+    results = dict(JSONFileReader().read_many(keys, cache.acquire, max_workers=2, release=cache.release))
+    assert results == {key: [i] for i, key in enumerate(keys)}
+    assert cache._pins == {}
+    assert cache._total_bytes <= 250
+
+
+def test_read_many_releases_prefetched_files_when_closed_early(tmp_path: Path, storage: FileSystemStorage):
+    keys = write_sheets(tmp_path / "store", 10)
+    cache = CachedStorage(storage, str(tmp_path / "cache"), max_bytes=250)
+    reader = JSONFileReader().read_many(keys, cache.acquire, max_workers=2, release=cache.release)
+    next(reader)
+    reader.close()
+    assert cache._pins == {}
+    assert cache._acquired == {}
+
+
+def test_read_many_releases_when_parsing_fails(tmp_path: Path, storage: FileSystemStorage):
+    keys = write_sheets(tmp_path / "store", 10)
+    cache = CachedStorage(storage, str(tmp_path / "cache"), max_bytes=250)
+    with pytest.raises(ValueError, match="broken sheet"):
+        list(FailingReader().read_many(keys, cache.acquire, max_workers=2, release=cache.release))
+    assert cache._pins == {}
+
+
+def test_read_many_does_not_release_failed_fetches(tmp_path: Path, storage: FileSystemStorage):
+    keys = write_sheets(tmp_path / "store", 4)
+    released: list[str] = []
+
+    def fetch(key: str) -> str:
+        if key == keys[0]:
+            raise OSError("download failed")
+        return storage.local_path(key)
+
+    with pytest.raises(OSError, match="download failed"):
+        list(JSONFileReader().read_many(keys, fetch, max_workers=1, release=released.append))
+    assert keys[0] not in released
+
+
+def test_cache_evicts_least_recently_used(tmp_path: Path, storage: FileSystemStorage):
+    keys = write_sheets(tmp_path / "store", 3)
+    cache = CachedStorage(storage, str(tmp_path / "cache"), max_bytes=250)
+    first = cache.local_path(keys[0])
+    second = cache.local_path(keys[1])
+    cache.local_path(keys[0])
+    cache.local_path(keys[2])
+    assert os.path.exists(first)
+    assert not os.path.exists(second)
+    assert cache._total_bytes == 200
+
+
+def test_cache_keeps_pinned_files_until_released(tmp_path: Path, storage: FileSystemStorage):
+    keys = write_sheets(tmp_path / "store", 3)
+    cache = CachedStorage(storage, str(tmp_path / "cache"), max_bytes=150)
+    pinned = cache.acquire(keys[0])
+    cache.local_path(keys[1])
+    cache.local_path(keys[2])
+    assert os.path.exists(pinned)
+    cache.release(keys[0])
+    assert not os.path.exists(pinned)
+    assert cache._total_bytes <= 150
+
+
+def test_cache_downloads_again_after_version_change(tmp_path: Path, storage: FileSystemStorage):
+    keys = write_sheets(tmp_path / "store", 1)
+    cache = CachedStorage(storage, str(tmp_path / "cache"))
+    old_path = cache.local_path(keys[0])
+    assert cache.read_range(keys[0], 0, 3) == b"[0]"
+
+    sheet = tmp_path / "store" / keys[0]
+    sheet.write_text('["corrected"]')
+    stat = sheet.stat()
+    os.utime(sheet, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+    new_path = cache.local_path(keys[0])
+    assert new_path != old_path
+    assert JSONFileReader().read(new_path) == ["corrected"]
+
+
+def test_cache_keeps_files_while_they_are_read(tmp_path: Path, storage: FileSystemStorage):
+    keys = write_sheets(tmp_path / "store", 3)
+    cache = CachedStorage(storage, str(tmp_path / "cache"), max_bytes=150)
+    cached = cache.local_path(keys[0])
+    assert cache.read_range(keys[0], 0, 3) == b"[0]"
+    assert cache._pins == {}
+
+    chunks = cache.stream(keys[0], chunk_size=10)
+    first = next(chunks)
+    cache.local_path(keys[1])
+    cache.local_path(keys[2])
+    assert os.path.exists(cached)
+    assert first + b"".join(chunks) == b"[0]".ljust(100)
+    assert cache._pins == {}
+    assert not os.path.exists(cached)